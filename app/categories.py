@@ -1,53 +1,58 @@
-"""Category definitions for time tracking activities."""
+"""Category definitions for time tracking activities.
+
+Each group is kept sorted by length (longest first) so config.py can merge
+the groups into a globally length-sorted tuple without re-sorting.
+"""
 
 categories = dict()
+
 categories["Физическая активность"] = (
-    "йога",
     "велопокатушка",
+    "йога",
 )
 
 categories["Музыка"] = (
-    "музыка",
-    "калимба",
-    "гитара",
-    "балалайка",
-    "пение",
-    "банджо",
-    "пианино",
-    "вистл",
+    "занятие теорией музыки",
+    "занятие виолончелью",
+    "занятие скрипкой",
+    "занятие гитарой",
+    "занятие флейтой",
+    "занятие альтом",
+    "занятие пением",
+    "занятие басом",
+    "занятие арфой",
     "блокфлейта",
+    "виолончель",
+    "балалайка",
+    "мандолина",
     "саламури",
+    "калимба",
+    "пианино",
     "скрипка",
     "квинтон",
-    "альт",
-    "виолончель",
-    "эрху",
+    "музыка",
+    "гитара",
+    "банджо",
     "гиджак",
-    "мандолина",
     "бузуки",
+    "пение",
+    "вистл",
+    "альт",
+    "эрху",
     "бас",
     "уд",
-    "занятие гитарой",
-    "занятие басом",
-    "занятие скрипкой",
-    "занятие альтом",
-    "занятие виолончелью",
-    "занятие пением",
-    "занятие флейтой",
-    "занятие арфой",
-    "занятие теорией музыки",
 )
 
 categories["Бытовое"] = (
-    "быт",
+    "утренние процедуры",
+    "вечерние процедуры",
+    "к выходу готов",
     "побрился",
     "помылся",
     "уборка",
     "ремонт",
     "утро",
-    "утренние процедуры",
-    "вечерние процедуры",
-    "к выходу готов",
+    "быт",
 )
 
 categories["Медицина"] = (
@@ -57,41 +62,41 @@ categories["Медицина"] = (
 
 categories["Техническое"] = (
     "программирование",
-    "электроника",
-    "config",
     "анализ данных",
+    "электроника",
     "gamedev",
+    "config",
 )
 
 categories["Языки"] = (
-    "английский",
     "занятие английским",
+    "английский",
 )
 
 categories["Отдых"] = (
-    "худ",
+    "прогулка",
     "аниме",
     "манга",
     "фильм",
     "думал",
-    "прогулка",
     "гамак",
+    "худ",
 )
 
 categories["Работа"] = (
-    "работа",
     "занятие вождением",
     "вождение",
+    "работа",
 )
 
 categories["Хобби"] = (
-    "кожа",
-    "шитьё",
+    "моделирование",
     "велосипед",
+    "рисование",
     "мастерил",
-    "моделирование",
-    "знание",
     "tracker",
-    "рисование",
     "токарка",
+    "знание",
+    "шитьё",
+    "кожа",
 )
@@ -1,30 +1,72 @@
 """Configuration constants and settings for the bot."""
 
+import heapq
 import os
+import re
+from dataclasses import dataclass
 from typing import Final
 from app.categories import categories
 
 try:
-    # Load variables from a .env file if present
+    # Load variables from a .env file if present. The environment sentinel
+    # survives re-imports under a different module identity (WSGI workers,
+    # reloaders), so the .env file is scanned at most once per process.
     from dotenv import load_dotenv
 
-    load_dotenv()
+    if os.environ.get("_DOTENV_LOADED") != "1":
+        load_dotenv(override=False)
+        os.environ["_DOTENV_LOADED"] = "1"
 except Exception:
     # If python-dotenv is not installed, fall back silently to environment only
     pass
 
-# Bot configuration
-BOT_TOKEN: Final[str] = os.getenv("BOT_TOKEN", "")
 
-# Import categories from categories.py and flatten them
+@dataclass(frozen=True)
+class Settings:
+    """Immutable application settings, read from the environment once."""
 
-CATEGORIES: Final[list[str]] = []
-for category_name, subcategories in categories.items():
-    CATEGORIES.extend(subcategories)
+    bot_token: str
+    auto_process_delay: int  # seconds
+    log_format: str
+    log_level: str
 
-# Processing settings
-AUTO_PROCESS_DELAY: Final[int] = 2  # seconds
 
-# Logging configuration
-LOG_FORMAT: Final[str] = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-LOG_LEVEL: Final[str] = "INFO"
+settings: Final[Settings] = Settings(
+    bot_token=os.getenv("BOT_TOKEN", ""),
+    auto_process_delay=2,
+    log_format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    log_level="INFO",
+)
+
+# Import categories from categories.py and flatten them into an immutable
+# tuple — downstream code only iterates, and the derived structures below
+# rely on this never changing after import
+CATEGORIES: Final[tuple[str, ...]] = tuple(
+    sub for subs in categories.values() for sub in subs
+)
+assert CATEGORIES, "CATEGORIES must be non-empty"
+
+# Length-sorted view for the hot categorization path (longest first, so the
+# longest category wins). Each group in categories.py is already sorted by
+# length, so a stable merge is enough — no full re-sort at import.
+CATEGORIES_BY_LEN: Final[tuple[str, ...]] = tuple(
+    heapq.merge(*categories.values(), key=len, reverse=True)
+)
+# Ready-made "=category=" wrappers keyed by lowercased category, so the
+# match path reuses one prebuilt string instead of formatting a new one
+CATEGORY_WRAPPED: Final[dict[str, str]] = {c.lower(): f"={c}=" for c in CATEGORIES}
+
+# First characters of all categories (lowercased) for O(1) rejection of
+# content that cannot possibly start with a category
+CATEGORY_FIRST_CHARS: Final[frozenset[str]] = frozenset(
+    c[0].lower() for c in CATEGORIES
+)
+
+# Single combined alternation matching a category as a word-bounded prefix.
+# Compiled once at import time; alternatives are length-sorted so the regex
+# engine prefers the longest category. Built over lowercased categories and
+# matched against already-lowercased content, avoiding the per-character
+# case-folding that re.IGNORECASE would do at match time.
+CATEGORY_ALT_RE: Final[re.Pattern[str]] = re.compile(
+    r"^(" + "|".join(re.escape(c.lower()) for c in CATEGORIES_BY_LEN) + r")(?:\s+|$)"
+)
@@ -1,10 +1,10 @@
 """Command and message handlers for the bot."""
 
-import asyncio
 import logging
 import re
+from datetime import datetime
 
-from telegram import Update
+from telegram import Message, Update
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -13,20 +13,41 @@ from telegram.ext import (
     filters,
 )
 
-from app.models import get_chat_data
+from app.models import StoredMessage, get_chat_data
 from app.services import (
-    auto_process_delayed,
     clear_chat_data,
     format_timestamp,
-    process_selected_messages,
+    process_selected_locked,
     safe_delete_message,
     safe_edit_message,
+    schedule_auto_process,
     create_new_pinned_message,
 )
-from app.config import CATEGORIES
+from app.config import CATEGORY_ALT_RE, CATEGORY_FIRST_CHARS, CATEGORY_WRAPPED
 
 logger = logging.getLogger(__name__)
 
+# Optional ".H.MM" / ".HH.MM" prefix overriding the message timestamp
+_TIME_PREFIX_RE = re.compile(r"^\.(\d{1,2})\.(\d{2})(?:\s+|$)")
+
+# Local timezone resolved once at import; astimezone() with no argument
+# re-probes the OS timezone database on every call
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+
+class DotMessageFilter(filters.MessageFilter):
+    """Match only text messages starting with '.'.
+
+    Rejecting other chatter in the dispatcher avoids scheduling the
+    echo_message coroutine (and the chat-data lookup) for regular messages.
+    """
+
+    def filter(self, message: Message) -> bool:
+        return bool(message.text) and message.text.startswith(".")
+
+
+DOT_MESSAGE = DotMessageFilter(name="filters.DOT_MESSAGE")
+
 
 # Command handlers
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -46,7 +67,7 @@ async def process_selected_command(
 ) -> None:
     """Manual process command for immediate processing."""
     chat_id = update.effective_chat.id
-    await process_selected_messages(chat_id, context)
+    await process_selected_locked(chat_id, context)
 
 
 async def clear_selected_command(
@@ -65,9 +86,6 @@ async def echo_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         return
 
     text = update.message.text
-    if not text.startswith("."):
-        return
-
     chat_id = update.effective_chat.id
     data = get_chat_data(chat_id)
 
@@ -80,8 +98,7 @@ async def echo_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     # Extract and store the message data
     # Support prefixes ".H.MM" or ".HH.MM" to override timestamp
-    time_prefix_regex = r"^\.(\d{1,2})\.(\d{2})(?:\s+|$)"
-    match = re.match(time_prefix_regex, text)
+    match = _TIME_PREFIX_RE.match(text)
     if match:
         hours = int(match.group(1))
         minutes = int(match.group(2))
@@ -103,47 +120,47 @@ async def echo_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         # Convert UTC to the user's local timezone (same timezone as the chat interface)
         try:
             # Convert UTC to local timezone
-            local_time = message_time.astimezone()
+            local_time = message_time.astimezone(_LOCAL_TZ)
             timestamp = local_time.strftime("%H.%M")
         except Exception:
             # Fallback to current time if conversion fails
             timestamp = format_timestamp()
 
-    # Normalize content: lowercase first letter if it exists
-    if clean_content and clean_content[0].isupper():
-        clean_content = clean_content[0].lower() + clean_content[1:]
+    # Normalize content: lowercase first letter if it exists.
+    # Slicing handles the empty string without a separate truthiness check.
+    if clean_content[:1].isupper():
+        clean_content = clean_content[:1].lower() + clean_content[1:]
 
-    # Apply category formatting: find first category occurring as a separate word prefix
+    # Apply category formatting: find the longest category occurring as a
+    # word-bounded prefix via a single match of the combined alternation
     formatted_content = clean_content
-    if CATEGORIES and formatted_content:
-        # Sort categories by length descending to prefer longest match first
-        for category in sorted(CATEGORIES, key=len, reverse=True):
-            # Check if content starts with the category (case-insensitive)
-            if formatted_content.lower().startswith(category.lower()):
-                # Check if it's followed by space or end of string
-                if (
-                    len(formatted_content) == len(category)
-                    or formatted_content[len(category)] == " "
-                ):
-                    matched_cat = formatted_content[: len(category)]
-                    rest = formatted_content[len(category) :].strip()
-                    if rest:
-                        formatted_content = f"={matched_cat}= ({rest})"
-                    else:
-                        # If no rest, still wrap the category and leave no parentheses
-                        formatted_content = f"={matched_cat}="
-                    break
-
-    message_data = {
-        "message_id": update.message.message_id,
-        "content": formatted_content,
-        "timestamp": timestamp,
-    }
-
-    data.selected_messages.append(message_data)
-
-    # Auto-process after a delay to allow for multiple messages
-    asyncio.create_task(auto_process_delayed(chat_id, context))
+    # Fast reject: no category starts with this character
+    if formatted_content and formatted_content[0].lower() in CATEGORY_FIRST_CHARS:
+        # str.lower() preserves length for the category alphabet, so match
+        # indices on the lowered copy map 1:1 onto the original content
+        content_lower = formatted_content.lower()
+        cat_match = CATEGORY_ALT_RE.match(content_lower)
+        if cat_match:
+            wrapped = CATEGORY_WRAPPED[cat_match.group(1)]
+            rest = formatted_content[cat_match.end() :].strip()
+            if rest:
+                formatted_content = f"{wrapped} ({rest})"
+            else:
+                # If no rest, still wrap the category and leave no parentheses
+                formatted_content = wrapped
+
+    data.selected_messages.append(
+        StoredMessage(
+            message_id=update.message.message_id,
+            content=formatted_content,
+            timestamp=timestamp,
+        )
+    )
+    data.dirty = True
+
+    # Auto-process after a delay to allow for multiple messages; the per-chat
+    # debounce timer collapses a burst into one processing pass
+    schedule_auto_process(chat_id, context)
 
 
 async def remove_last_message(chat_id: int, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -154,16 +171,16 @@ async def remove_last_message(chat_id: int, context: ContextTypes.DEFAULT_TYPE)
         # No messages to remove
         return
 
-    # Remove the last processed message
+    # Remove the last processed message and its formatted line
     data.processed_messages.pop()
+    if data.summary_lines:
+        data.summary_lines.pop()
+    data.summary_cache = "\n".join(data.summary_lines)
+    data.dirty = True
 
     # Update the pinned message with remaining messages
     if data.processed_messages:
-        # Create the updated summary text
-        summary_lines = [
-            f"{msg['timestamp']} {msg['content']}" for msg in data.processed_messages
-        ]
-        summary_text = "\n".join(summary_lines)
+        summary_text = data.summary_cache
 
         # Update or create pinned message
         if data.pinned_message_id:
@@ -175,6 +192,7 @@ async def remove_last_message(chat_id: int, context: ContextTypes.DEFAULT_TYPE)
                 await create_new_pinned_message(chat_id, context, summary_text)
         else:
             await create_new_pinned_message(chat_id, context, summary_text)
+        data.last_pinned_text = summary_text
     else:
         # No more messages, clear the pinned message
         if data.pinned_message_id:
@@ -183,7 +201,7 @@ async def remove_last_message(chat_id: int, context: ContextTypes.DEFAULT_TYPE)
                 await safe_delete_message(context, chat_id, data.pinned_message_id)
                 data.clear_pinned()
             except Exception as e:
-                logger.warning(f"Could not clear pinned message: {e}")
+                logger.warning("Could not clear pinned message: %s", e)
 
 
 async def remove_service_messages(
@@ -206,7 +224,7 @@ def setup_handlers(application: Application) -> None:
 
     # Message handlers
     application.add_handler(
-        MessageHandler(filters.TEXT & ~filters.COMMAND, echo_message)
+        MessageHandler(DOT_MESSAGE & ~filters.COMMAND, echo_message)
     )
     application.add_handler(
         MessageHandler(filters.StatusUpdate.ALL, remove_service_messages)
@@ -2,8 +2,10 @@
 
 import json
 import logging
+import os
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
@@ -15,18 +17,41 @@ app = FastAPI(title="Mukit Bot", version="1.0.0")
 # Status file for communication with the bot process
 STATUS_FILE = Path("/tmp/mukit_bot_status.json")
 
+# Cached status: (monotonic time of last check, file mtime_ns, parsed dict).
+# The TTL absorbs health-probe bursts; the mtime check skips re-parsing when
+# the bot hasn't written a new status.
+_STATUS_TTL = 0.25  # seconds
+_status_cache: Optional[Tuple[float, int, Dict[str, Any]]] = None
+
 
 def get_bot_status() -> Dict[str, Any]:
     """Get the current status of the bot process."""
+    global _status_cache
+
+    now = time.monotonic()
+    if _status_cache is not None and now - _status_cache[0] < _STATUS_TTL:
+        return _status_cache[2]
+
     try:
-        if STATUS_FILE.exists():
-            with open(STATUS_FILE, "r") as f:
-                return json.load(f)
-        else:
-            return {"status": "not_running", "error": "Status file not found"}
+        mtime_ns = os.stat(STATUS_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return {"status": "not_running", "error": "Status file not found"}
     except Exception as e:
         return {"status": "error", "error": f"Failed to read status: {e}"}
 
+    if _status_cache is not None and _status_cache[1] == mtime_ns:
+        _status_cache = (now, mtime_ns, _status_cache[2])
+        return _status_cache[2]
+
+    try:
+        with open(STATUS_FILE, "r") as f:
+            parsed = json.load(f)
+    except Exception as e:
+        return {"status": "error", "error": f"Failed to read status: {e}"}
+
+    _status_cache = (now, mtime_ns, parsed)
+    return parsed
+
 
 @app.get("/")
 async def root() -> JSONResponse:
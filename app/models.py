@@ -1,41 +1,83 @@
 """Data models and structures for the bot."""
 
-from typing import Dict, List, Optional
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(slots=True)
+class StoredMessage:
+    """A dot-message captured from the chat, waiting to be processed."""
+
+    message_id: int
+    content: str
+    timestamp: str
+
+
+@dataclass(slots=True)
+class ProcessedMessage:
+    """An entry in the pinned summary, with its category cached for the
+    duplicate check."""
+
+    timestamp: str
+    content: str
+    category: Optional[str] = None
 
 
 class ChatData:
     """Data structure to hold all chat-related information."""
 
     def __init__(self):
-        self.selected_messages: List[Dict] = []
-        self.processed_messages: List[Dict] = []
+        self.selected_messages: List[StoredMessage] = []
+        self.processed_messages: List[ProcessedMessage] = []
+        # Preformatted "HH.MM content" lines kept in sync with
+        # processed_messages, so summaries need a join but no reformatting
+        self.summary_lines: List[str] = []
+        # Joined summary text kept in sync with summary_lines: appends are
+        # O(1); replacements and removals rebuild from summary_lines
+        self.summary_cache: str = ""
         self.pinned_message_id: Optional[int] = None
+        # Text currently shown in the pinned message, to skip no-op edits
+        self.last_pinned_text: str = ""
+        # Debounce timer for auto-processing; re-armed on each new message so
+        # a burst of messages triggers one processing pass, not one per message
+        self.debounce_handle: Optional[asyncio.TimerHandle] = None
+        # Serializes processing passes for this chat, so a manual /process
+        # cannot race the debounced pass over the same selected messages
+        self.lock: asyncio.Lock = asyncio.Lock()
+        # Set on every mutation; a future persistence backend should flush
+        # dirty chats from a coalescing background task (write-behind) rather
+        # than writing synchronously on the hot path
+        self.dirty: bool = False
 
     def clear_selected(self) -> None:
         """Clear selected messages."""
         self.selected_messages.clear()
 
     def clear_processed(self) -> None:
-        """Clear processed messages."""
+        """Clear processed messages and their formatted summary lines."""
         self.processed_messages.clear()
+        self.summary_lines.clear()
+        self.summary_cache = ""
 
     def clear_pinned(self) -> None:
-        """Clear pinned message ID."""
+        """Clear pinned message ID and its remembered text."""
         self.pinned_message_id = None
+        self.last_pinned_text = ""
 
     def clear_all(self) -> None:
         """Clear all data."""
         self.clear_selected()
         self.clear_processed()
         self.clear_pinned()
+        self.dirty = True
 
 
-# Global storage: {chat_id: ChatData}
-chat_data: Dict[int, ChatData] = {}
+# Global storage: {chat_id: ChatData}, created on first access
+chat_data: defaultdict[int, ChatData] = defaultdict(ChatData)
 
 
 def get_chat_data(chat_id: int) -> ChatData:
     """Get or create chat data for the given chat ID."""
-    if chat_id not in chat_data:
-        chat_data[chat_id] = ChatData()
     return chat_data[chat_id]
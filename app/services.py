@@ -2,19 +2,45 @@
 
 import asyncio
 import logging
-from datetime import datetime
+import re
+import time
+from typing import Optional
 
 from telegram.ext import ContextTypes
 
-from app.config import AUTO_PROCESS_DELAY
-from app.models import get_chat_data
+from app.config import settings
+from app.models import ProcessedMessage, get_chat_data
 
 logger = logging.getLogger(__name__)
 
+# Category marker at the start of formatted content, e.g. "=йога= (час)"
+_CAT_RE = re.compile(r"^=([^=]+)=")
+
+
+def _extract_category(content: str) -> Optional[str]:
+    """Extract the lowercased category from "=category=..." content, if any."""
+    m = _CAT_RE.match(content)
+    return m.group(1).lower() if m else None
+
+
+# Memoized timestamp: (epoch minute, formatted "HH.MM" string)
+_last_timestamp = (-1, "")
+
 
 def format_timestamp() -> str:
-    """Get current timestamp in HH.MM format."""
-    return datetime.now().strftime("%H.%M")
+    """Get current timestamp in HH.MM format.
+
+    Memoized per minute: consecutive calls within the same minute (common
+    during bursts) return the cached string without re-reading the clock
+    through localtime.
+    """
+    global _last_timestamp
+
+    minute = int(time.time() // 60)
+    if minute != _last_timestamp[0]:
+        t = time.localtime()
+        _last_timestamp = (minute, f"{t.tm_hour:02d}.{t.tm_min:02d}")
+    return _last_timestamp[1]
 
 
 async def safe_delete_message(
@@ -25,7 +51,7 @@ async def safe_delete_message(
         await context.bot.delete_message(chat_id, message_id)
         return True
     except Exception as e:
-        logger.warning(f"Could not delete message {message_id}: {e}")
+        logger.warning("Could not delete message %s: %s", message_id, e)
         return False
 
 
@@ -39,7 +65,7 @@ async def safe_edit_message(
         )
         return True
     except Exception as e:
-        logger.warning(f"Could not edit message {message_id}: {e}")
+        logger.warning("Could not edit message %s: %s", message_id, e)
         return False
 
 
@@ -56,7 +82,7 @@ async def create_new_pinned_message(
         data = get_chat_data(chat_id)
         data.pinned_message_id = summary_message.message_id
     except Exception as e:
-        logger.error(f"Error creating pinned message: {e}")
+        logger.error("Error creating pinned message: %s", e)
 
 
 async def process_selected_messages(
@@ -68,27 +94,8 @@ async def process_selected_messages(
     if not data.selected_messages:
         return
 
+    data.dirty = True
     try:
-        # Check if our pinned message still exists before processing
-        pinned_message_was_removed = False
-        if data.pinned_message_id:
-            try:
-                # Check if there's still a pinned message in the chat
-                chat_info = await context.bot.get_chat(chat_id)
-                if (
-                    not hasattr(chat_info, "pinned_message")
-                    or chat_info.pinned_message is None
-                ):
-                    # No pinned message in chat, clear our data
-                    data.clear_processed()
-                    data.clear_pinned()
-                    pinned_message_was_removed = True
-            except Exception:
-                # Message doesn't exist or we can't access it, clear our data
-                data.clear_processed()
-                data.clear_pinned()
-                pinned_message_was_removed = True
-
         # Add new messages to processed messages list
         for msg_data in data.selected_messages:
             # For offline messages, we want to use the time when the message is actually processed,
@@ -97,12 +104,11 @@ async def process_selected_messages(
 
             # Check if this is a manually specified time by looking at the content
             # Manual times are passed through from handlers with the correct timestamp
-            original_timestamp = msg_data["timestamp"]
+            original_timestamp = msg_data.timestamp
 
             # Simple heuristic: if the timestamp is very different from current time,
             # it's likely manually specified (like .14.30 work)
-            current_time = datetime.now()
-            current_timestamp = current_time.strftime("%H.%M")
+            current_timestamp = format_timestamp()
 
             if original_timestamp != current_timestamp:
                 # Different from current time - likely manually specified, preserve it
@@ -111,71 +117,111 @@ async def process_selected_messages(
                 # Same as current time - use current time (handles offline messages correctly)
                 timestamp = format_timestamp()
 
-            new_message = {
-                "timestamp": timestamp,
-                "content": msg_data["content"],
-            }
-
-            # Check if this is a duplicate category (same category as the last message)
-            if data.processed_messages:
-                last_message = data.processed_messages[-1]
-                # Extract category from last message (between = signs)
-                last_content = last_message["content"]
-                if last_content.startswith("=") and "=" in last_content[1:]:
-                    last_category_end = last_content.find("=", 1)
-                    last_category = last_content[1:last_category_end]
-
-                    # Extract category from new message
-                    new_content = new_message["content"]
-                    if new_content.startswith("=") and "=" in new_content[1:]:
-                        new_category_end = new_content.find("=", 1)
-                        new_category = new_content[1:new_category_end]
-
-                        # If same category, replace the last message instead of adding new one
-                        if last_category.lower() == new_category.lower():
-                            data.processed_messages[-1] = new_message
-                            continue
+            # Extract the category once and cache it on the entry, so the
+            # duplicate check below is a single dict lookup instead of
+            # re-parsing the previous message's content
+            content = msg_data.content
+            category = _extract_category(content)
 
-            # If not a duplicate category, add as new message
-            data.processed_messages.append(new_message)
+            new_message = ProcessedMessage(
+                timestamp=timestamp,
+                content=content,
+                category=category,
+            )
 
-        # Create the complete summary text with all processed messages
-        summary_lines = [
-            f"{msg['timestamp']} {msg['content']}" for msg in data.processed_messages
-        ]
+            # If same category as the last message, replace it instead of adding
+            if (
+                category is not None
+                and data.processed_messages
+                and data.processed_messages[-1].category == category
+            ):
+                data.processed_messages[-1] = new_message
+                data.summary_lines[-1] = f"{timestamp} {content}"
+                # A replacement invalidates the cached join
+                data.summary_cache = "\n".join(data.summary_lines)
+                continue
 
-        if summary_lines:
-            summary_text = "\n".join(summary_lines)
+            # If not a duplicate category, add as new message
+            data.processed_messages.append(new_message)
+            line = f"{timestamp} {content}"
+            data.summary_lines.append(line)
+            data.summary_cache = (
+                f"{data.summary_cache}\n{line}" if data.summary_cache else line
+            )
 
-            # Always create new pinned message if the previous one was removed
-            if pinned_message_was_removed or not data.pinned_message_id:
+        if data.summary_lines:
+            summary_text = data.summary_cache
+
+            # Kick off deletion of all selected messages concurrently with the
+            # pinned-message update — each call is an independent round-trip.
+            # The bot method is bound once; the fan-out would otherwise repeat
+            # the context -> bot -> method attribute walk per message.
+            delete_message = context.bot.delete_message
+
+            async def _delete(message_id: int) -> None:
+                try:
+                    await delete_message(chat_id, message_id)
+                except Exception as e:
+                    logger.warning("Could not delete message %s: %s", message_id, e)
+
+            delete_tasks = [
+                asyncio.create_task(_delete(msg_data.message_id))
+                for msg_data in data.selected_messages
+            ]
+
+            # Skip the edit round-trip entirely when the text is unchanged
+            # (e.g. a duplicate-category replace produced an identical line)
+            if data.pinned_message_id and summary_text == data.last_pinned_text:
+                await asyncio.gather(*delete_tasks, return_exceptions=True)
+                data.selected_messages.clear()
+                return
+
+            # Update the existing pinned message if we have one; a failed edit
+            # (message deleted or unpinned out from under us) falls back to
+            # creating a fresh pinned message — no up-front get_chat probe
+            if not data.pinned_message_id:
                 await create_new_pinned_message(chat_id, context, summary_text)
             else:
-                # Try to update existing pinned message
                 success = await safe_edit_message(
                     context, chat_id, data.pinned_message_id, summary_text
                 )
                 if not success:
-                    # If edit failed, create new pinned message
+                    data.clear_pinned()
                     await create_new_pinned_message(chat_id, context, summary_text)
+            data.last_pinned_text = summary_text
 
-            # Delete all selected messages
-            for msg_data in data.selected_messages:
-                await safe_delete_message(context, chat_id, msg_data["message_id"])
+            await asyncio.gather(*delete_tasks, return_exceptions=True)
 
             # Clear the selected messages
             data.selected_messages.clear()
 
     except Exception as e:
-        logger.error(f"Error processing selected messages: {e}")
+        logger.error("Error processing selected messages: %s", e)
 
 
-async def auto_process_delayed(
+async def process_selected_locked(
     chat_id: int, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
-    """Auto-process selected messages after a delay."""
-    await asyncio.sleep(AUTO_PROCESS_DELAY)
-    await process_selected_messages(chat_id, context)
+    """Process selected messages under the per-chat lock."""
+    data = get_chat_data(chat_id)
+    async with data.lock:
+        await process_selected_messages(chat_id, context)
+
+
+def schedule_auto_process(chat_id: int, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """(Re)arm the per-chat debounce timer for auto-processing.
+
+    Each new message pushes the deadline back, so a burst of messages results
+    in a single processing pass once the chat goes quiet for the configured
+    delay.
+    """
+    data = get_chat_data(chat_id)
+    if data.debounce_handle is not None:
+        data.debounce_handle.cancel()
+    data.debounce_handle = asyncio.get_running_loop().call_later(
+        settings.auto_process_delay,
+        lambda: asyncio.create_task(process_selected_locked(chat_id, context)),
+    )
 
 
 async def clear_chat_data(chat_id: int, context: ContextTypes.DEFAULT_TYPE) -> bool:
@@ -193,16 +239,18 @@ async def clear_chat_data(chat_id: int, context: ContextTypes.DEFAULT_TYPE) -> b
         data.clear_processed()
         cleared = True
 
-    # Clear pinned message
+    # Clear pinned message: unpin and delete are independent round-trips
     if data.pinned_message_id:
         try:
-            await context.bot.unpin_chat_message(
-                chat_id, data.pinned_message_id, disable_notification=True
+            await asyncio.gather(
+                context.bot.unpin_chat_message(
+                    chat_id, data.pinned_message_id, disable_notification=True
+                ),
+                safe_delete_message(context, chat_id, data.pinned_message_id),
             )
-            await safe_delete_message(context, chat_id, data.pinned_message_id)
             data.clear_pinned()
             cleared = True
         except Exception as e:
-            logger.warning(f"Could not clear pinned message: {e}")
+            logger.warning("Could not clear pinned message: %s", e)
 
     return cleared
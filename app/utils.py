@@ -2,12 +2,12 @@
 
 import logging
 
-from app.config import LOG_FORMAT, LOG_LEVEL
+from app.config import settings
 
 
 def setup_logging() -> None:
     """Configure logging for the application."""
     logging.basicConfig(
-        format=LOG_FORMAT,
-        level=getattr(logging, LOG_LEVEL.upper()),
+        format=settings.log_format,
+        level=getattr(logging, settings.log_level.upper()),
     )
@@ -4,16 +4,16 @@
 import asyncio
 import json
 import logging
+import os
 import signal
 import sys
+import time
 from pathlib import Path
 
-from telegram.ext import Application
+from telegram.ext import AIORateLimiter, Application
+from telegram.request import HTTPXRequest
 
-# Add the app directory to Python path
-sys.path.insert(0, str(Path(__file__).parent / "app"))
-
-from app.config import BOT_TOKEN
+from app.config import settings
 from app.handlers import setup_handlers
 from app.utils import setup_logging
 
@@ -24,22 +24,34 @@ STATUS_FILE = Path("/tmp/mukit_bot_status.json")
 PID_FILE = Path("/tmp/mukit_bot.pid")
 
 
+# Last (status, error) written, to skip no-op rewrites
+_last_status = None
+
+
 def write_status(status: str, error: str = None) -> None:
-    """Write bot status to a file for FastAPI to read."""
+    """Write bot status to a file for FastAPI to read.
+
+    Writes to a temp file and renames it into place so readers never see a
+    half-written file; os.replace is atomic on POSIX.
+    """
+    global _last_status
+
+    if (status, error) == _last_status:
+        return
+
     try:
         status_data = {
             "status": status,
             "error": error,
-            "timestamp": (
-                asyncio.get_event_loop().time()
-                if asyncio.get_event_loop().is_running()
-                else 0
-            ),
+            "timestamp": time.time(),
         }
-        with open(STATUS_FILE, "w") as f:
+        tmp_file = STATUS_FILE.with_suffix(f".tmp.{os.getpid()}")
+        with open(tmp_file, "w") as f:
             json.dump(status_data, f)
+        os.replace(tmp_file, STATUS_FILE)
+        _last_status = (status, error)
     except Exception as e:
-        logger.error(f"Failed to write status: {e}")
+        logger.error("Failed to write status: %s", e)
 
 
 async def main() -> None:
@@ -47,15 +59,57 @@ async def main() -> None:
     setup_logging()
     write_status("starting")
 
-    if not BOT_TOKEN:
+    if not settings.bot_token:
         error_msg = "BOT_TOKEN environment variable is not set"
         logger.error(error_msg)
         write_status("error", error_msg)
         return
 
+    # Shutdown signals wake the idle wait below; between updates the process
+    # sleeps in epoll instead of waking every second
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
     try:
-        # Create application
-        application = Application.builder().token(BOT_TOKEN).build()
+        # Create application with a rate limiter so bursts are smoothed to
+        # Telegram's 30 msg/s global and 20 msg/min per-group limits instead
+        # of triggering 429s with long retry_after penalties. Size the HTTP
+        # connection pool for concurrent send/edit/delete fan-out (HTTP/2
+        # multiplexes them onto one socket), and give getUpdates its own
+        # request object so long polling does not steal send slots.
+        application = (
+            Application.builder()
+            .token(settings.bot_token)
+            .request(
+                HTTPXRequest(
+                    connection_pool_size=64,
+                    pool_timeout=20,
+                    connect_timeout=10,
+                    read_timeout=20,
+                    http_version="2",
+                )
+            )
+            .get_updates_request(
+                HTTPXRequest(
+                    connection_pool_size=1,
+                    connect_timeout=10,
+                    read_timeout=20,
+                    http_version="2",
+                )
+            )
+            .rate_limiter(
+                AIORateLimiter(
+                    overall_max_rate=30,
+                    overall_time_period=1,
+                    group_max_rate=20,
+                    group_time_period=60,
+                    max_retries=3,
+                )
+            )
+            .build()
+        )
         setup_handlers(application)
 
         write_status("initializing")
@@ -72,9 +126,8 @@ async def main() -> None:
 
         logger.info("Bot is running and polling for updates...")
 
-        # Keep the bot running
-        while True:
-            await asyncio.sleep(1)
+        # Keep the bot running until a shutdown signal arrives
+        await stop_event.wait()
 
     except Exception as e:
         error_msg = f"Bot error: {e}"
@@ -92,33 +145,32 @@ async def main() -> None:
                 logger.info("Shutting down Telegram application...")
                 await application.shutdown()
         except Exception as e:
-            logger.error(f"Error during shutdown: {e}")
+            logger.error("Error during shutdown: %s", e)
         write_status("stopped")
+        # Remove PID file
+        try:
+            if PID_FILE.exists():
+                PID_FILE.unlink()
+        except Exception:
+            pass
 
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals."""
-    logger.info(f"Received signal {signum}, shutting down...")
-    write_status("stopping")
-    # Remove PID file
+if __name__ == "__main__":
     try:
-        if PID_FILE.exists():
-            PID_FILE.unlink()
-    except Exception:
-        pass
-    sys.exit(0)
+        # Prefer uvloop's libuv-based event loop when available; it is a
+        # drop-in replacement that cuts per-callback overhead on the
+        # socket-heavy polling + concurrent-send workload
+        import uvloop
 
-
-if __name__ == "__main__":
-    # Set up signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+        uvloop.install()
+    except ImportError:
+        pass
 
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
-        logger.error(f"Bot crashed: {e}")
+        logger.error("Bot crashed: %s", e)
         write_status("error", str(e))
         sys.exit(1)